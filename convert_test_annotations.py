@@ -6,10 +6,15 @@ This script processes all test files to fix PHPUnit 11 deprecations.
 
 import os
 import re
+import sys
+import argparse
 from pathlib import Path
 
-def convert_file(filepath):
-    """Convert a single test file from @test to #[Test]."""
+def convert_content(filepath):
+    """Compute the converted content of a test file without writing it.
+
+    Returns (content, original_content).
+    """
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
@@ -17,7 +22,7 @@ def convert_file(filepath):
 
     # Check if file has @test annotations
     if '/** @test */' not in content and '/**@test*/' not in content:
-        return False
+        return content, original_content
 
     # Check if Test attribute import already exists
     has_test_import = 'use PHPUnit\\Framework\\Attributes\\Test;' in content
@@ -43,6 +48,22 @@ def convert_file(filepath):
     content = re.sub(r'    /\*\*@test\*\/\s*\n', '    #[Test]\n', content)
     content = re.sub(r'    /\*\*\s*@test\s*\*/\s*\n', '    #[Test]\n', content)
 
+    return content, original_content
+
+def convert_file(filepath, budget=None):
+    """Convert a single test file from @test to #[Test].
+
+    With a budget, conversion runs under it; an over-budget file is left
+    untouched and reported by the budget.
+    """
+    if budget is not None:
+        result = budget.run(convert_content, filepath)
+        if result is None:
+            return False
+    else:
+        result = convert_content(filepath)
+    content, original_content = result
+
     # Only write if content changed
     if content != original_content:
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -51,8 +72,21 @@ def convert_file(filepath):
 
     return False
 
+def find_test_files(test_dir=Path('tests')):
+    """Yield all PHP files under the tests directory."""
+    return test_dir.rglob('*.php')
+
 def main():
     """Process all test files."""
+    # Imported here so importing this module (test_impact_analysis.py does)
+    # leaves sys.path untouched
+    sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+    from i18n_budget import add_budget_arguments, budget_from_args
+
+    parser = argparse.ArgumentParser(description='Convert @test annotations to #[Test] attributes')
+    add_budget_arguments(parser)
+    budget = budget_from_args(parser.parse_args())
+
     test_dir = Path('tests')
     files_processed = 0
     files_modified = 0
@@ -61,15 +95,18 @@ def main():
     print("-" * 60)
 
     # Find all PHP test files
-    for php_file in test_dir.rglob('*.php'):
+    for php_file in find_test_files(test_dir):
         files_processed += 1
-        if convert_file(php_file):
+        if convert_file(php_file, budget):
             files_modified += 1
             print(f"✓ Modified: {php_file}")
 
     print("-" * 60)
     print(f"Processed: {files_processed} files")
     print(f"Modified: {files_modified} files")
+    print(f"Quarantined: {len(budget.quarantined)} files")
+    for item in budget.quarantined:
+        print(f"  ✗ {item['file']}: {item['reason']}")
     print("Conversion complete!")
 
 if __name__ == '__main__':
@@ -0,0 +1,91 @@
+/**
+ * Translation Loader - Frontend Client
+ *
+ * Lazy-loads per-domain translation chunks (see scripts/i18n_processor.py)
+ * so pages only fetch the domains they use instead of a whole locale
+ */
+class TranslationLoader {
+    constructor(manifest) {
+        this.manifest = manifest;
+        this.loaded = new Map();
+    }
+
+    /**
+     * Current page locale, from <html lang="...">
+     *
+     * @returns {string}
+     */
+    locale() {
+        return document.documentElement.lang || 'ar';
+    }
+
+    /**
+     * Load one translation domain for a locale
+     *
+     * @param {string} domain - Domain name (e.g., 'campaigns')
+     * @param {string} [locale] - Defaults to the page locale
+     * @returns {Promise<Object>}
+     */
+    async load(domain, locale = this.locale()) {
+        const url = this.manifest[locale]?.[domain];
+        if (!url) {
+            console.error('Unknown translation domain:', locale, domain);
+            return {};
+        }
+
+        if (!this.loaded.has(url)) {
+            // Chunks are content-hashed, so the browser can cache them forever
+            const request = fetch(url)
+                .then((response) => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status} loading ${url}`);
+                    }
+                    return response.json();
+                })
+                .catch((error) => {
+                    console.error('Translation load error:', error);
+                    this.loaded.delete(url);
+                    return {};
+                });
+            this.loaded.set(url, request);
+        }
+
+        return this.loaded.get(url);
+    }
+
+    /**
+     * Load several domains at once
+     *
+     * @param {Array<string>} domains
+     * @param {string} [locale]
+     * @returns {Promise<Object>} Translations keyed by domain
+     */
+    async loadAll(domains, locale = this.locale()) {
+        const chunks = await Promise.all(domains.map((domain) => this.load(domain, locale)));
+        return Object.fromEntries(domains.map((domain, i) => [domain, chunks[i]]));
+    }
+
+    /**
+     * Translate a 'domain.key' string from already-loaded chunks
+     *
+     * @param {string} key - Dot-notation key (e.g., 'campaigns.created_success')
+     * @param {Object} translations - Result of loadAll()
+     * @returns {string} The translation, or the key if missing
+     */
+    trans(key, translations) {
+        const value = key.split('.').reduce((node, part) => node?.[part], translations);
+        return typeof value === 'string' ? value : key;
+    }
+}
+
+// Create singleton instance
+// eslint-disable-next-line no-undef
+const translationLoader = new TranslationLoader(typeof __I18N_MANIFEST__ !== 'undefined' ? __I18N_MANIFEST__ : {});
+
+// Export for use in modules
+export default translationLoader;
+
+// Also make available globally (for non-module scripts)
+if (typeof window !== 'undefined') {
+    window.TranslationLoader = translationLoader;
+}
@@ -0,0 +1,72 @@
+"""
+CMIS Per-file Budget Guard
+Enforces byte and time budgets on per-file regex work so one pathological
+(generated or minified) file is quarantined instead of stalling a run
+"""
+
+import os
+import signal
+import threading
+from contextlib import contextmanager
+
+DEFAULT_MAX_BYTES = 512 * 1024
+DEFAULT_MAX_SECONDS = 5.0
+
+
+class BudgetExceeded(Exception):
+    """A file went over its byte or time budget"""
+
+
+@contextmanager
+def _watchdog(seconds):
+    # SIGALRM interrupts long-running regex matches; it is only available on
+    # POSIX and in the main thread, otherwise only the byte budget applies.
+    if (not seconds or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def on_timeout(signum, frame):
+        raise BudgetExceeded(f"exceeded {seconds:g}s time budget")
+
+    previous = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class FileBudget:
+    """Runs per-file work under a byte/time budget and collects quarantined files"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_seconds=DEFAULT_MAX_SECONDS):
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.quarantined = []
+
+    def run(self, func, filepath, *args, default=None):
+        """Call func(filepath, *args); on budget overrun quarantine filepath and return default"""
+        try:
+            size = os.path.getsize(filepath)
+            if self.max_bytes and size > self.max_bytes:
+                raise BudgetExceeded(f"{size} bytes exceeds {self.max_bytes} byte budget")
+
+            with _watchdog(self.max_seconds):
+                return func(filepath, *args)
+        except BudgetExceeded as e:
+            self.quarantined.append({'file': str(filepath), 'reason': str(e)})
+            return default
+
+
+def add_budget_arguments(parser):
+    """Add the shared --max-file-bytes/--max-file-seconds options to an argparse parser"""
+    parser.add_argument('--max-file-bytes', type=int, default=DEFAULT_MAX_BYTES, metavar='N',
+                        help=f'quarantine files larger than N bytes (default: {DEFAULT_MAX_BYTES}, 0 = no limit)')
+    parser.add_argument('--max-file-seconds', type=float, default=DEFAULT_MAX_SECONDS, metavar='S',
+                        help=f'quarantine files taking longer than S seconds (default: {DEFAULT_MAX_SECONDS:g}, 0 = no limit)')
+
+
+def budget_from_args(args):
+    return FileBudget(args.max_file_bytes, args.max_file_seconds)
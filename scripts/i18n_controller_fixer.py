@@ -2,14 +2,25 @@
 """
 CMIS Controller i18n Fixer
 Systematically replaces hardcoded messages with translation keys
+
+Usage:
+    i18n_controller_fixer.py                          # single-node analysis
+    i18n_controller_fixer.py --shard 2/4 -o part2.json  # one CI node
+    i18n_controller_fixer.py --merge part*.json       # combine partials
 """
 
 import os
 import re
+import sys
 import json
+import hashlib
+import argparse
 from pathlib import Path
 from collections import defaultdict
 
+from i18n_budget import add_budget_arguments, budget_from_args
+from i18n_store import AnalysisStore
+
 # Base directory
 BASE_DIR = Path('/home/cmis-test/public_html')
 CONTROLLERS_DIR = BASE_DIR / 'app/Http/Controllers'
@@ -137,45 +148,174 @@ def scan_controller(filepath):
 
     return domain, messages
 
-def main():
-    """Main processing function"""
+def iter_controller_files():
+    """Yield controller paths in a stable, filesystem-independent order"""
+    for root, dirs, files in os.walk(CONTROLLERS_DIR):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith('.php'):
+                yield os.path.join(root, filename)
+
+def shard_of(filepath, shard_count):
+    """Map a controller to a shard (0-based) by hashing its path relative to BASE_DIR"""
+    rel_path = Path(os.path.relpath(filepath, BASE_DIR)).as_posix()
+    digest = hashlib.sha1(rel_path.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count
+
+def parse_shard(value):
+    """Parse an 'i/N' shard spec (1-based) into (index, count)"""
+    match = re.fullmatch(r'(\d+)/(\d+)', value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}', expected i/N")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got '{value}'")
+    return index, count
+
+def scan_controllers(shard=None, budget=None):
+    """Scan controllers, optionally only those in the given (index, count) shard.
+
+    Returns a list of entries carrying the file's position in the full walk so
+    partial results can be merged back into single-node order. With a budget,
+    files over it are skipped and left in budget.quarantined.
+    """
+    entries = []
+    for position, filepath in enumerate(iter_controller_files()):
+        if shard and shard_of(filepath, shard[1]) != shard[0] - 1:
+            continue
+
+        if budget is not None:
+            domain, messages = budget.run(scan_controller, filepath, default=(None, []))
+        else:
+            domain, messages = scan_controller(filepath)
+        if messages:
+            entries.append({
+                'position': position,
+                'domain': domain,
+                'file': filepath,
+                'messages': messages
+            })
+    return entries
+
+def build_output(entries, quarantined=()):
+    """Build the i18n_analysis structure from scanned entries"""
     all_messages = defaultdict(list)
-    files_processed = 0
     total_messages = 0
 
-    # Scan all controllers
-    for root, dirs, files in os.walk(CONTROLLERS_DIR):
-        for filename in files:
-            if filename.endswith('.php'):
-                filepath = os.path.join(root, filename)
-                domain, messages = scan_controller(filepath)
-
-                if messages:
-                    files_processed += 1
-                    total_messages += len(messages)
-                    all_messages[domain].extend([{
-                        'file': filepath,
-                        'messages': messages
-                    }])
-
-    # Output results as JSON
-    output = {
+    for entry in sorted(entries, key=lambda e: e['position']):
+        total_messages += len(entry['messages'])
+        all_messages[entry['domain']].append({
+            'file': entry['file'],
+            'messages': entry['messages']
+        })
+
+    return {
         'summary': {
-            'files_processed': files_processed,
+            'files_processed': len(entries),
             'total_messages': total_messages,
-            'domains': list(all_messages.keys())
+            'domains': list(all_messages.keys()),
+            'files_quarantined': len(quarantined)
         },
-        'messages_by_domain': dict(all_messages)
+        'messages_by_domain': dict(all_messages),
+        'quarantined': sorted(quarantined, key=lambda q: q['file'])
     }
 
-    output_file = BASE_DIR / 'scripts/i18n_analysis.json'
+def merge_partials(partial_files):
+    """Combine shard partials into the single-node analysis output"""
+    entries = []
+    quarantined = []
+    seen_shards = set()
+    shard_count = None
+
+    for partial_file in partial_files:
+        with open(partial_file, 'r', encoding='utf-8') as f:
+            partial = json.load(f)
+
+        index, count = partial['shard']['index'], partial['shard']['count']
+        if shard_count is None:
+            shard_count = count
+        elif count != shard_count:
+            raise ValueError(f"{partial_file}: shard count {count} does not match {shard_count}")
+        if index in seen_shards:
+            raise ValueError(f"{partial_file}: shard {index}/{count} given more than once")
+
+        seen_shards.add(index)
+        entries.extend(partial['entries'])
+        quarantined.extend(partial['quarantined'])
+
+    missing = sorted(set(range(1, (shard_count or 0) + 1)) - seen_shards)
+    if missing:
+        raise ValueError(f"missing partials for shard(s): {', '.join(f'{i}/{shard_count}' for i in missing)}")
+
+    return build_output(entries, quarantined)
+
+def write_json(data, output_file):
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def main():
+    """Main processing function"""
+    parser = argparse.ArgumentParser(description='Scan controllers for hardcoded messages')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help='only scan controllers in shard i of N (1-based) and write a partial')
+    parser.add_argument('--merge', nargs='+', metavar='PARTIAL',
+                        help='merge shard partials into the full analysis')
+    parser.add_argument('-o', '--output', type=Path,
+                        help='output file (default: scripts/i18n_analysis.json, '
+                             'or scripts/i18n_analysis.part-i-of-N.json with --shard)')
+    parser.add_argument('--sqlite', type=Path, metavar='DB',
+                        help='also upsert the analysis into this SQLite store')
+    add_budget_arguments(parser)
+    args = parser.parse_args()
+
+    if args.shard and args.merge:
+        parser.error('--shard and --merge are mutually exclusive')
+    if args.shard and args.sqlite:
+        parser.error('--sqlite cannot be used with --shard; pass it to --merge instead')
+
+    if args.merge:
+        try:
+            output = merge_partials(args.merge)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Merge failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        output_file = args.output or BASE_DIR / 'scripts/i18n_analysis.json'
+        write_json(output, output_file)
+        print(f"Merged {len(args.merge)} partials")
+    elif args.shard:
+        index, count = args.shard
+        budget = budget_from_args(args)
+        entries = scan_controllers(args.shard, budget)
+        output_file = args.output or BASE_DIR / f'scripts/i18n_analysis.part-{index}-of-{count}.json'
+        write_json({
+            'shard': {'index': index, 'count': count},
+            'entries': entries,
+            'quarantined': budget.quarantined
+        }, output_file)
+        print(f"Shard {index}/{count} complete!")
+        print(f"Files processed: {len(entries)}")
+        print(f"Total messages found: {sum(len(e['messages']) for e in entries)}")
+        print(f"Files quarantined: {len(budget.quarantined)}")
+        print(f"Partial saved to: {output_file}")
+        return
+    else:
+        budget = budget_from_args(args)
+        output = build_output(scan_controllers(budget=budget), budget.quarantined)
+        output_file = args.output or BASE_DIR / 'scripts/i18n_analysis.json'
+        write_json(output, output_file)
+
+    if args.sqlite:
+        with AnalysisStore(args.sqlite) as store:
+            changed = store.sync_analysis(output)
+        print(f"SQLite store updated: {changed} files changed in {args.sqlite}")
 
+    summary = output['summary']
     print(f"Analysis complete!")
-    print(f"Files processed: {files_processed}")
-    print(f"Total messages found: {total_messages}")
-    print(f"Domains identified: {len(all_messages)}")
+    print(f"Files processed: {summary['files_processed']}")
+    print(f"Total messages found: {summary['total_messages']}")
+    print(f"Domains identified: {len(summary['domains'])}")
+    for item in output['quarantined']:
+        print(f"Quarantined: {item['file']} ({item['reason']})")
     print(f"Results saved to: {output_file}")
 
 if __name__ == '__main__':
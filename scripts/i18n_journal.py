@@ -0,0 +1,79 @@
+"""
+CMIS i18n Checkpoint Journal
+Append-only record of files completed by the replacer/processor so an
+interrupted run can be resumed with --resume
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+
+class JournalMismatch(Exception):
+    """A journaled file was modified after it was recorded as completed"""
+
+
+def file_hash(filepath):
+    """SHA-256 of a file's contents, or None if it does not exist"""
+    try:
+        with open(filepath, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class CheckpointJournal:
+    """One JSON line per completed file: {"file", "before", "after", ...}"""
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.entries = {}
+
+        if resume:
+            self._load()
+        else:
+            # Fresh run: start a new journal
+            self.path.write_text('', encoding='utf-8')
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write; that file is redone
+                    continue
+                self.entries[entry['file']] = entry
+
+    def completed(self, filepath):
+        """Return the journal entry if filepath was already completed.
+
+        Raises JournalMismatch if the file changed since it was recorded.
+        """
+        entry = self.entries.get(str(filepath))
+        if entry is None:
+            return None
+
+        current = file_hash(filepath)
+        if current != entry['after']:
+            raise JournalMismatch(
+                f"{filepath} changed since it was journaled "
+                f"(expected {entry['after']}, found {current})"
+            )
+        return entry
+
+    def record(self, filepath, before, after, **extra):
+        """Append a completed file to the journal and flush it to disk"""
+        entry = {'file': str(filepath), 'before': before, 'after': after, **extra}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[entry['file']] = entry
+
+    def __len__(self):
+        return len(self.entries)
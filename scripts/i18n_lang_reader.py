@@ -0,0 +1,145 @@
+"""
+CMIS i18n Lang Reader
+Reads Laravel PHP lang files (return [...] arrays) into Python dicts
+without needing a PHP runtime
+"""
+
+import re
+from pathlib import Path
+
+TOKEN_PATTERN = re.compile(r'''
+    (?P<ws>\s+|//[^\n]*|\#[^\n]*|/\*.*?\*/)
+  | (?P<open_tag><\?php)
+  | (?P<sq>'(?:[^'\\]|\\.)*')
+  | (?P<dq>"(?:[^"\\]|\\.)*")
+  | (?P<arrow>=>)
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<word>[A-Za-z_]\w*)
+  | (?P<punct>[\[\](),;.])
+''', re.VERBOSE | re.DOTALL)
+
+DQ_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"', '$': '$'}
+
+
+class LangParseError(ValueError):
+    """A lang file uses syntax beyond plain literal arrays"""
+
+
+def _tokenize(source):
+    pos = 0
+    tokens = []
+    while pos < len(source):
+        match = TOKEN_PATTERN.match(source, pos)
+        if not match:
+            raise LangParseError(f"unexpected character {source[pos]!r} at offset {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind in ('ws', 'open_tag'):
+            continue
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+def _unquote(kind, raw):
+    body = raw[1:-1]
+    if kind == 'sq':
+        return re.sub(r"\\([\\'])", r'\1', body)
+    return re.sub(r'\\(.)', lambda m: DQ_ESCAPES.get(m.group(1), m.group(0)), body)
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            raise LangParseError(f"expected {value or 'token'}, got {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def parse_file(self):
+        while self.peek() != ('word', 'return'):
+            self.take()
+        self.take('return')
+        return self.parse_value()
+
+    def parse_value(self):
+        kind, value = self.peek()
+        if kind in ('sq', 'dq'):
+            parts = [_unquote(*self.take())]
+            while self.peek() == ('punct', '.'):
+                self.take('.')
+                parts.append(_unquote(*self.take()))
+            return ''.join(parts)
+        if kind == 'number':
+            self.take()
+            return float(value) if '.' in value else int(value)
+        if value == '[':
+            self.take('[')
+            return self.parse_items(']')
+        if kind == 'word' and value.lower() == 'array':
+            self.take()
+            self.take('(')
+            return self.parse_items(')')
+        if kind == 'word' and value.lower() in ('true', 'false', 'null'):
+            self.take()
+            return {'true': True, 'false': False, 'null': None}[value.lower()]
+        raise LangParseError(f"unsupported value {value!r}")
+
+    def parse_items(self, closing):
+        items = {}
+        next_index = 0
+        while self.peek()[1] != closing:
+            key = self.parse_value()
+            if self.peek()[0] == 'arrow':
+                self.take()
+                items[key] = self.parse_value()
+            else:
+                items[next_index] = key
+                next_index += 1
+            # PHP requires a comma between items; only the last may omit it
+            separator = self.peek()[1]
+            if separator == ',':
+                self.take(',')
+            elif separator != closing:
+                raise LangParseError(f"expected ',' or {closing!r}, got {separator!r}")
+        self.take(closing)
+        return items
+
+
+def parse_lang_source(source):
+    """Parse the source of a PHP lang file into a (possibly nested) dict"""
+    return _Parser(_tokenize(source)).parse_file()
+
+
+def load_lang_file(path):
+    """Load a PHP lang file into a (possibly nested) dict"""
+    try:
+        return parse_lang_source(Path(path).read_text(encoding='utf-8'))
+    except LangParseError as e:
+        raise LangParseError(f"{path}: {e}") from None
+
+
+def flatten(translations, prefix=''):
+    """Flatten nested translations into dot-notation keys, as used by __()"""
+    flat = {}
+    for key, value in translations.items():
+        full_key = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{full_key}.'))
+        else:
+            flat[full_key] = value
+    return flat
+
+
+def load_lang_tree(lang_dir, locale):
+    """Load every domain file for a locale: {domain: translations}"""
+    return {
+        path.stem: load_lang_file(path)
+        for path in sorted((Path(lang_dir) / locale).glob('*.php'))
+    }
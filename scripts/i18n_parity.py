@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+CMIS i18n Parity Check
+Compares ar/en keys across lang/ and resources/lang/ and optionally
+consolidates both trees into the canonical one
+
+Laravel loads resources/lang when it exists, so lang/ is only read by
+this check and --consolidate merges it into resources/lang.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from i18n_lang_reader import LangParseError, flatten, load_lang_file, load_lang_tree, parse_lang_source
+
+BASE_DIR = Path('/home/cmis-test/public_html')
+CANONICAL_TREE = 'resources/lang'
+LEGACY_TREE = 'lang'
+LOCALES = ('ar', 'en')
+
+def load_key_sets(base_dir):
+    """Load every side once: {(tree, locale): {domain: {key: value}}}"""
+    sides = {}
+    for tree in (CANONICAL_TREE, LEGACY_TREE):
+        for locale in LOCALES:
+            sides[(tree, locale)] = {
+                domain: flatten(translations)
+                for domain, translations in load_lang_tree(base_dir / tree, locale).items()
+            }
+    return sides
+
+def locale_drift(sides, tree):
+    """Keys present in one locale of a tree but not the other, per domain"""
+    ar, en = sides[(tree, 'ar')], sides[(tree, 'en')]
+    drift = {}
+    for domain in sorted(ar.keys() | en.keys()):
+        ar_keys = ar.get(domain, {}).keys()
+        en_keys = en.get(domain, {}).keys()
+        missing_ar = sorted(en_keys - ar_keys)
+        missing_en = sorted(ar_keys - en_keys)
+        if missing_ar or missing_en:
+            drift[domain] = {'missing_ar': missing_ar, 'missing_en': missing_en}
+    return drift
+
+def tree_divergence(sides):
+    """Domains defined in both trees, with keys or values that differ"""
+    divergence = {}
+    for locale in LOCALES:
+        canonical, legacy = sides[(CANONICAL_TREE, locale)], sides[(LEGACY_TREE, locale)]
+        for domain in sorted(canonical.keys() & legacy.keys()):
+            c, l = canonical[domain], legacy[domain]
+            only_legacy = sorted(l.keys() - c.keys())
+            conflicts = sorted(k for k in l.keys() & c.keys() if l[k] != c[k])
+            if only_legacy or conflicts:
+                divergence.setdefault(domain, {})[locale] = {
+                    'only_in_legacy': only_legacy,
+                    'conflicting_values': conflicts,
+                }
+    return divergence
+
+def build_report(sides):
+    return {
+        'locale_drift': {tree: locale_drift(sides, tree) for tree in (CANONICAL_TREE, LEGACY_TREE)},
+        'legacy_only_domains': {
+            locale: sorted(sides[(LEGACY_TREE, locale)].keys() - sides[(CANONICAL_TREE, locale)].keys())
+            for locale in LOCALES
+        },
+        'tree_divergence': tree_divergence(sides),
+    }
+
+def php_literal(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def render_entries(translations, indent=1):
+    """Render a (possibly nested) dict as PHP array entries"""
+    pad = '    ' * indent
+    lines = []
+    for key, value in translations.items():
+        if isinstance(value, dict):
+            lines.append(f"{pad}{php_literal(key)} => [")
+            lines.extend(render_entries(value, indent + 1))
+            lines.append(f"{pad}],")
+        else:
+            lines.append(f"{pad}{php_literal(key)} => {php_literal(value)},")
+    return lines
+
+def deep_merge(target, source):
+    """Add keys from source missing in target's nested arrays; return count added"""
+    added = 0
+    for key, value in source.items():
+        if key not in target:
+            target[key] = value
+            added += 1
+        elif isinstance(target[key], dict) and isinstance(value, dict):
+            added += deep_merge(target[key], value)
+    return added
+
+def render_file(translations):
+    return '<?php\n\nreturn [\n' + '\n'.join(render_entries(translations)) + '\n];\n'
+
+def append_entries(content, entries):
+    """Insert rendered entries before the closing ]; of content
+
+    Returns None when there is no ]; to insert before or the result would
+    not parse (e.g. array(...) syntax, a trailing comment), so the caller
+    re-renders the whole file instead.
+    """
+    insertion_point = content.rfind('];')
+    if insertion_point == -1:
+        return None
+    head = content[:insertion_point].rstrip()
+    tail = '\n' + '\n'.join(render_entries(entries)) + '\n' + content[insertion_point:]
+    # Add a separator only when the last entry lacks one
+    for separator in ('', ','):
+        merged = head + separator + tail
+        try:
+            parse_lang_source(merged)
+        except LangParseError:
+            continue
+        return merged
+    return None
+
+def consolidate(base_dir):
+    """Merge lang/ into resources/lang; return (actions, unresolved files)"""
+    actions = []
+    unresolved = []
+
+    for locale in LOCALES:
+        for legacy_path in sorted((base_dir / LEGACY_TREE / locale).glob('*.php')):
+            canonical_path = base_dir / CANONICAL_TREE / locale / legacy_path.name
+            legacy = load_lang_file(legacy_path)
+
+            if not canonical_path.exists():
+                canonical_path.parent.mkdir(parents=True, exist_ok=True)
+                canonical_path.write_text(legacy_path.read_text(encoding='utf-8'), encoding='utf-8')
+                legacy_path.unlink()
+                actions.append(f"Moved: {legacy_path} -> {canonical_path}")
+                continue
+
+            canonical = load_lang_file(canonical_path)
+            missing = {k: v for k, v in legacy.items() if k not in canonical}
+            nested_missing = deep_merge(canonical, {k: v for k, v in legacy.items() if k in canonical})
+
+            merged = None
+            if missing and not nested_missing:
+                merged = append_entries(canonical_path.read_text(encoding='utf-8'), missing)
+
+            if merged is not None:
+                canonical_path.write_text(merged, encoding='utf-8')
+                actions.append(f"Merged {len(missing)} keys: {legacy_path} -> {canonical_path}")
+            elif missing or nested_missing:
+                # Keys missing inside existing nested arrays, or no ]; to
+                # insert before: rewrite the whole file
+                canonical.update(missing)
+                canonical_path.write_text(render_file(canonical), encoding='utf-8')
+                actions.append(f"Rewrote with {nested_missing + len(missing)} merged keys: "
+                               f"{legacy_path} -> {canonical_path}")
+
+            # Check what was actually written before removing the source
+            try:
+                written = flatten(load_lang_file(canonical_path))
+            except LangParseError as e:
+                unresolved.append({'file': str(legacy_path), 'keys': [], 'error': str(e)})
+                continue
+            flat_legacy = flatten(legacy)
+            leftovers = sorted(k for k in flat_legacy if written.get(k) != flat_legacy[k])
+            if leftovers:
+                unresolved.append({'file': str(legacy_path), 'keys': leftovers})
+            else:
+                legacy_path.unlink()
+                actions.append(f"Removed: {legacy_path}")
+
+    return actions, unresolved
+
+def print_report(report):
+    for tree, drift in report['locale_drift'].items():
+        print(f"\n{tree}: {len(drift)} domains with ar/en drift")
+        for domain, keys in drift.items():
+            if keys['missing_ar']:
+                print(f"  - {domain}: {len(keys['missing_ar'])} missing in ar ({', '.join(keys['missing_ar'][:5])})")
+            if keys['missing_en']:
+                print(f"  - {domain}: {len(keys['missing_en'])} missing in en ({', '.join(keys['missing_en'][:5])})")
+
+    for locale, domains in report['legacy_only_domains'].items():
+        if domains:
+            print(f"\nOnly in {LEGACY_TREE}/{locale} (not loaded by Laravel): {', '.join(domains)}")
+
+    for domain, locales in report['tree_divergence'].items():
+        for locale, diff in locales.items():
+            print(f"\n{domain} ({locale}) differs between trees: "
+                  f"{len(diff['only_in_legacy'])} keys only in {LEGACY_TREE}, "
+                  f"{len(diff['conflicting_values'])} conflicting values")
+
+def has_issues(report):
+    return (any(report['locale_drift'].values()) or any(report['legacy_only_domains'].values())
+            or bool(report['tree_divergence']))
+
+def main():
+    """Main processing"""
+    parser = argparse.ArgumentParser(description='Check ar/en key parity across both lang trees')
+    parser.add_argument('--base-dir', type=Path, default=BASE_DIR)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--consolidate', action='store_true',
+                        help=f'merge {LEGACY_TREE}/ into {CANONICAL_TREE}/ and remove merged files')
+    args = parser.parse_args()
+
+    if args.consolidate:
+        actions, unresolved = consolidate(args.base_dir)
+        for action in actions:
+            print(f"✓ {action}")
+        for item in unresolved:
+            if 'error' in item:
+                print(f"✗ Kept {item['file']}: merged file does not parse ({item['error']})")
+            else:
+                print(f"✗ Kept {item['file']}: {len(item['keys'])} keys differ from {CANONICAL_TREE}")
+
+    report = build_report(load_key_sets(args.base_dir))
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    sys.exit(1 if has_issues(report) else 0)
+
+if __name__ == '__main__':
+    main()
@@ -6,13 +6,30 @@ Generates translation files and replaces hardcoded strings
 
 import os
 import re
+import sys
 import json
+import hashlib
+import argparse
 from pathlib import Path
 from collections import defaultdict
 
+from i18n_journal import CheckpointJournal, JournalMismatch, file_hash
+from i18n_lang_reader import flatten, load_lang_tree
+from i18n_store import AnalysisStore
+from i18n_translation_memory import TranslationMemory, safe_to_reuse
+
 BASE_DIR = Path('/home/cmis-test/public_html')
 CONTROLLERS_DIR = BASE_DIR / 'app/Http/Controllers'
 LANG_DIR = BASE_DIR / 'resources/lang'
+JOURNAL_FILE = BASE_DIR / 'scripts/i18n_processor.journal.jsonl'
+
+# Hashed per-locale, per-domain JSON chunks for lazy loading in the front end
+JSON_CHUNKS_DIR = BASE_DIR / 'public/lang'
+JSON_CHUNKS_URL = '/lang'
+JSON_MANIFEST_FILE = JSON_CHUNKS_DIR / 'manifest.json'
+
+# Minimum shingle similarity for a message to count as a near-duplicate
+SIMILARITY_THRESHOLD = 0.75
 
 # Domain mapping from controller path/name
 DOMAIN_MAP = {
@@ -78,9 +95,17 @@ def load_analysis():
     with open(BASE_DIR / 'scripts/i18n_analysis.json', 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def organize_by_proper_domain(analysis):
-    """Re-organize messages by proper domain names"""
+def organize_by_proper_domain(analysis, memory=None, reuse_similar=False):
+    """Re-organize messages by proper domain names
+
+    With a translation memory, messages that nearly duplicate an existing
+    value in the same domain and language are returned as suggestions. With
+    reuse_similar, a message is only folded into an existing key when
+    safe_to_reuse() holds (same text up to stopwords, digits, placeholders
+    and negations); other near-duplicates stay suggestions.
+    """
     organized = defaultdict(lambda: {'ar': {}, 'en': {}})
+    suggestions = []
 
     for old_domain, files in analysis['messages_by_domain'].items():
         for file_info in files:
@@ -93,13 +118,45 @@ def organize_by_proper_domain(analysis):
                 key_parts = msg['key'].split('.')
                 key_name = key_parts[-1] if len(key_parts) > 1 else 'message'
 
+                if memory is not None:
+                    matches = [m for m in memory.query(lang, text, domain) if m[2] != key_name]
+                    reusable = [m for m in matches if safe_to_reuse(text, m[3])] if reuse_similar else []
+                    if matches:
+                        score, _, similar_key, similar_text = (reusable or matches)[0]
+                        suggestions.append({
+                            'domain': domain,
+                            'lang': lang,
+                            'text': text,
+                            'key': key_name,
+                            'similar_key': similar_key,
+                            'similar_text': similar_text,
+                            'score': round(score, 3),
+                            'reused': bool(reusable)
+                        })
+                        if reusable:
+                            continue
+
                 # Store translation
                 organized[domain][lang][key_name] = text
+                if memory is not None:
+                    memory.add(lang, domain, key_name, text)
 
-    return organized
+    return organized, suggestions
 
-def generate_lang_files(organized_messages):
-    """Generate PHP language files"""
+def key_aliases(suggestions):
+    """Map reused near-duplicate texts to the existing full key, per domain"""
+    aliases = defaultdict(dict)
+    for item in suggestions:
+        if item['reused']:
+            aliases[item['domain']][item['text']] = f"{item['domain']}.{item['similar_key']}"
+    return dict(aliases)
+
+def generate_lang_files(organized_messages, journal=None):
+    """Generate PHP language files
+
+    With a journal, files completed by an earlier run are skipped and each
+    newly written file is recorded once it is done.
+    """
     generated_files = []
 
     for domain, translations in organized_messages.items():
@@ -109,6 +166,12 @@ def generate_lang_files(organized_messages):
 
             file_path = lang_dir / f'{domain}.php'
 
+            if journal is not None and journal.completed(file_path) is not None:
+                generated_files.append(f"Skipped (journaled): {file_path}")
+                continue
+
+            before = file_hash(file_path)
+
             # Check if file exists
             if file_path.exists():
                 # File exists, merge translations
@@ -154,15 +217,100 @@ return [
 
                 generated_files.append(f"Created: {file_path}")
 
+            if journal is not None:
+                journal.record(file_path, before, file_hash(file_path))
+
     return generated_files
 
+def chunk_is_complete(chunk_path, digest):
+    """Whether chunk_path exists and its content still matches its name's hash"""
+    try:
+        data = chunk_path.read_bytes()
+    except OSError:
+        return False
+    return hashlib.sha256(data).hexdigest()[:10] == digest
+
+def write_atomic(path, content):
+    """Write via a temp file in the same directory so a killed run never
+    leaves a truncated file under the final name"""
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def generate_json_chunks():
+    """Emit content-hashed JSON chunks per locale/domain plus a manifest
+
+    Chunks are named {domain}.{hash}.json so they can be cached forever;
+    chunks no longer referenced by the manifest are removed.
+    """
+    manifest = {}
+    written = 0
+
+    for lang in ['ar', 'en']:
+        chunk_dir = JSON_CHUNKS_DIR / lang
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        manifest[lang] = {}
+
+        for domain, translations in load_lang_tree(LANG_DIR, lang).items():
+            content = json.dumps(translations, ensure_ascii=False, separators=(',', ':'))
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+            chunk_name = f'{domain}.{digest}.json'
+
+            chunk_path = chunk_dir / chunk_name
+            if not chunk_is_complete(chunk_path, digest):
+                write_atomic(chunk_path, content)
+                written += 1
+
+            manifest[lang][domain] = f'{JSON_CHUNKS_URL}/{lang}/{chunk_name}'
+
+        # Drop stale chunks from previous runs
+        current = {Path(url).name for url in manifest[lang].values()}
+        for stale in [*chunk_dir.glob('*.json'), *chunk_dir.glob('.*.tmp')]:
+            if stale.name not in current:
+                stale.unlink()
+
+    write_atomic(JSON_MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True))
+
+    return manifest, written
+
 def main():
     """Main processing"""
+    parser = argparse.ArgumentParser(description='Generate lang files from the i18n analysis')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip lang files completed by a previous interrupted run')
+    parser.add_argument('--suggest-similar', action='store_true',
+                        help='report new messages that nearly duplicate existing translations')
+    parser.add_argument('--reuse-similar', action='store_true',
+                        help='reuse the existing key for near-duplicate messages instead of adding one')
+    parser.add_argument('--sqlite', type=Path, metavar='DB',
+                        help='also upsert all lang keys into this SQLite store')
+    args = parser.parse_args()
+
+    journal = CheckpointJournal(JOURNAL_FILE, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(journal)} lang files already completed")
+
     print("Loading analysis...")
     analysis = load_analysis()
 
+    memory = None
+    if args.suggest_similar or args.reuse_similar:
+        print("Building translation memory...")
+        memory = TranslationMemory.from_lang_dir(LANG_DIR, threshold=SIMILARITY_THRESHOLD)
+        print(f"  Indexed {len(memory)} existing translations")
+
     print("Organizing by proper domains...")
-    organized = organize_by_proper_domain(analysis)
+    organized, suggestions = organize_by_proper_domain(analysis, memory, args.reuse_similar)
+
+    if suggestions:
+        print(f"\nNear-duplicate messages: {len(suggestions)}")
+        for item in suggestions[:10]:
+            action = 'reusing' if item['reused'] else 'consider'
+            print(f"  - {item['domain']}.{item['key']} -> {action} {item['domain']}.{item['similar_key']} "
+                  f"({item['score']:.2f})")
 
     print(f"\nDomains identified: {len(organized)}")
     for domain in organized:
@@ -171,7 +319,11 @@ def main():
         print(f"  - {domain}: {ar_count} AR keys, {en_count} EN keys")
 
     print("\nGenerating language files...")
-    generated = generate_lang_files(organized)
+    try:
+        generated = generate_lang_files(organized, journal)
+    except JournalMismatch as e:
+        print(f"✗ Cannot resume: {e}", file=sys.stderr)
+        sys.exit(1)
 
     print(f"\n✓ Generated/updated {len(generated)} language files")
     for file in generated[:10]:  # Show first 10
@@ -180,6 +332,19 @@ def main():
     if len(generated) > 10:
         print(f"  ... and {len(generated) - 10} more")
 
+    print("\nGenerating JSON translation chunks...")
+    manifest, written = generate_json_chunks()
+    chunk_count = sum(len(domains) for domains in manifest.values())
+    print(f"✓ {chunk_count} chunks in manifest ({written} new) -> {JSON_MANIFEST_FILE}")
+
+    if args.sqlite:
+        changed = 0
+        with AnalysisStore(args.sqlite) as store:
+            for lang in ['ar', 'en']:
+                for domain, translations in load_lang_tree(LANG_DIR, lang).items():
+                    changed += store.sync_keys(lang, domain, flatten(translations))
+        print(f"✓ SQLite store updated: {changed} key rows changed in {args.sqlite}")
+
     # Save organized structure
     output = {
         'domains': list(organized.keys()),
@@ -189,7 +354,10 @@ def main():
                 for lang, trans in translations.items()
             }
             for domain, translations in organized.items()
-        }
+        },
+        'similar_messages': suggestions,
+        # Read by i18n_replacer.py: {domain: {text: existing_key}}
+        'key_aliases': key_aliases(suggestions)
     }
 
     with open(BASE_DIR / 'scripts/i18n_organized.json', 'w', encoding='utf-8') as f:
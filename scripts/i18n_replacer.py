@@ -6,12 +6,20 @@ Replaces hardcoded strings with translation keys in controllers
 
 import os
 import re
+import sys
 import json
+import argparse
 from pathlib import Path
 from collections import defaultdict
 
+from i18n_budget import add_budget_arguments, budget_from_args
+from i18n_journal import CheckpointJournal, JournalMismatch, file_hash
+from i18n_store import AnalysisStore
+
 BASE_DIR = Path('/home/cmis-test/public_html')
 CONTROLLERS_DIR = BASE_DIR / 'app/Http/Controllers'
+JOURNAL_FILE = BASE_DIR / 'scripts/i18n_replacer.journal.jsonl'
+ORGANIZED_FILE = BASE_DIR / 'scripts/i18n_organized.json'
 
 # Domain mapping (same as processor)
 DOMAIN_MAP = {
@@ -121,21 +129,45 @@ def generate_translation_key(domain, message_type, text):
         slug = re.sub(r'[-\s]+', '_', slug)
         return f'{domain}.{slug[:50]}'
 
-def replace_in_file(filepath):
-    """Replace hardcoded strings in a single controller file"""
+def load_key_aliases():
+    """Existing keys chosen by the processor for near-duplicate messages"""
+    try:
+        with open(ORGANIZED_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('key_aliases', {})
+    except FileNotFoundError:
+        return {}
+
+KEY_ALIASES = load_key_aliases()
+
+def translation_key(domain, message_type, text):
+    """Translation key for text, preferring a reused existing key"""
+    alias = KEY_ALIASES.get(domain, {}).get(text)
+    return alias or generate_translation_key(domain, message_type, text)
+
+def rewrite_content(filepath):
+    """Compute the rewritten content of a controller file without writing it
+
+    Returns (content, original_content, replacements, keys written).
+    """
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
     original_content = content
     domain = get_domain_from_path(filepath)
     replacements = 0
+    keys = set()
+
+    def key_for(message_type, text):
+        key = translation_key(domain, message_type, text)
+        keys.add(key)
+        return key
 
     # Pattern 1: with('type', 'message')
     def replace_flash(match):
         nonlocal replacements
         msg_type = match.group(1)
         msg_text = match.group(2)
-        key = generate_translation_key(domain, msg_type, msg_text)
+        key = key_for(msg_type, msg_text)
         replacements += 1
         return f"with('{msg_type}', __('{key}'))"
 
@@ -149,7 +181,7 @@ def replace_in_file(filepath):
     def replace_json(match):
         nonlocal replacements
         msg_text = match.group(1)
-        key = generate_translation_key(domain, 'message', msg_text)
+        key = key_for('message', msg_text)
         replacements += 1
         return f"['message'] => __('{key}')"
 
@@ -162,7 +194,7 @@ def replace_in_file(filepath):
     # More robust pattern for message arrays
     content = re.sub(
         r"(\[(?:'|\")?message(?:'|\")?\]\s*=>\s*)'([^']+)'",
-        lambda m: m.group(1) + f"__('{generate_translation_key(domain, 'message', m.group(2))}')",
+        lambda m: m.group(1) + f"__('{key_for('message', m.group(2))}')",
         content
     )
 
@@ -171,7 +203,7 @@ def replace_in_file(filepath):
         nonlocal replacements
         exception_type = match.group(1)
         msg_text = match.group(2)
-        key = generate_translation_key(domain, 'error', msg_text)
+        key = key_for('error', msg_text)
         replacements += 1
         return f"{exception_type}(__('{key}'))"
 
@@ -181,15 +213,45 @@ def replace_in_file(filepath):
         content
     )
 
+    return content, original_content, replacements, sorted(keys)
+
+def replace_in_file(filepath, budget=None):
+    """Replace hardcoded strings in a single controller file
+
+    Returns (replacements, keys written). With a budget, the rewrite runs
+    under it; an over-budget file is left untouched and None is returned.
+    """
+    if budget is not None:
+        result = budget.run(rewrite_content, filepath)
+        if result is None:
+            return None
+    else:
+        result = rewrite_content(filepath)
+    content, original_content, replacements, keys = result
+
     # Only write if changes were made
     if content != original_content:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
-        return replacements
-    return 0
+        return replacements, keys
+    return 0, []
 
 def main():
     """Main processing"""
+    parser = argparse.ArgumentParser(description='Replace hardcoded strings in controllers')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip files completed by a previous interrupted run')
+    parser.add_argument('--sqlite', type=Path, metavar='DB',
+                        help='also upsert the replacement report into this SQLite store')
+    add_budget_arguments(parser)
+    args = parser.parse_args()
+
+    budget = budget_from_args(args)
+
+    journal = CheckpointJournal(JOURNAL_FILE, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(journal)} files already completed")
+
     print("Replacing hardcoded strings in controllers...")
 
     total_files_modified = 0
@@ -201,7 +263,23 @@ def main():
         for filename in files:
             if filename.endswith('.php'):
                 filepath = os.path.join(root, filename)
-                replacements = replace_in_file(filepath)
+
+                try:
+                    entry = journal.completed(filepath)
+                except JournalMismatch as e:
+                    print(f"✗ Cannot resume: {e}", file=sys.stderr)
+                    sys.exit(1)
+
+                if entry is not None:
+                    replacements, keys = entry['replacements'], entry.get('keys', [])
+                else:
+                    before = file_hash(filepath)
+                    result = replace_in_file(filepath, budget)
+                    if result is None:
+                        continue
+                    replacements, keys = result
+                    journal.record(filepath, before, file_hash(filepath),
+                                   replacements=replacements, keys=keys)
 
                 if replacements > 0:
                     total_files_modified += 1
@@ -209,20 +287,29 @@ def main():
                     rel_path = os.path.relpath(filepath, BASE_DIR)
                     modified_files.append({
                         'file': rel_path,
-                        'replacements': replacements
+                        'replacements': replacements,
+                        'keys': keys
                     })
 
     print(f"\n✓ Processing complete!")
     print(f"  Files modified: {total_files_modified}")
     print(f"  Total replacements: {total_replacements}")
+    print(f"  Files quarantined: {len(budget.quarantined)}")
+    for item in budget.quarantined:
+        print(f"    {os.path.relpath(item['file'], BASE_DIR)}: {item['reason']}")
 
     # Save report
     report = {
         'summary': {
             'files_modified': total_files_modified,
-            'total_replacements': total_replacements
+            'total_replacements': total_replacements,
+            'files_quarantined': len(budget.quarantined)
         },
-        'modified_files': modified_files
+        'modified_files': modified_files,
+        'quarantined': [
+            {'file': os.path.relpath(item['file'], BASE_DIR), 'reason': item['reason']}
+            for item in budget.quarantined
+        ]
     }
 
     with open(BASE_DIR / 'scripts/i18n_replacement_report.json', 'w', encoding='utf-8') as f:
@@ -230,6 +317,11 @@ def main():
 
     print(f"\n✓ Report saved to scripts/i18n_replacement_report.json")
 
+    if args.sqlite:
+        with AnalysisStore(args.sqlite) as store:
+            store.sync_replacements(modified_files)
+        print(f"✓ SQLite store updated: {args.sqlite}")
+
     # Show top 10 modified files
     if modified_files:
         print(f"\nTop modified files:")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+CMIS i18n Analysis Store
+Optional SQLite database mirroring the i18n JSON reports with indexed
+tables, so questions like "which files use key X" don't need the whole
+report parsed
+
+Usage:
+    i18n_store.py DB files-using KEY
+    i18n_store.py DB untranslated DOMAIN
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    domain TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_domain ON files(domain);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    msg_type TEXT,
+    lang TEXT NOT NULL,
+    key TEXT NOT NULL,
+    text TEXT NOT NULL,
+    original TEXT NOT NULL,
+    replacement TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_key ON messages(key);
+CREATE INDEX IF NOT EXISTS idx_messages_file ON messages(file_id);
+
+CREATE TABLE IF NOT EXISTS keys (
+    domain TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (domain, lang, key)
+);
+
+CREATE TABLE IF NOT EXISTS replacements (
+    path TEXT PRIMARY KEY,
+    replacements INTEGER NOT NULL
+);
+
+-- Keys i18n_replacer.py actually wrote into each file
+CREATE TABLE IF NOT EXISTS replacement_keys (
+    path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (path, key)
+);
+CREATE INDEX IF NOT EXISTS idx_replacement_keys_key ON replacement_keys(key);
+'''
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class AnalysisStore:
+    """Upserts i18n tool output into SQLite, touching only changed rows"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sync_analysis(self, analysis):
+        """Mirror i18n_controller_fixer.py output; returns number of files rewritten"""
+        changed = 0
+        seen = set()
+        existing = dict(self.conn.execute('SELECT path, digest FROM files'))
+
+        with self.conn:
+            for domain, files in analysis['messages_by_domain'].items():
+                for file_info in files:
+                    path = file_info['file']
+                    seen.add(path)
+                    digest = _digest([domain, file_info['messages']])
+                    if existing.get(path) == digest:
+                        continue
+
+                    changed += 1
+                    self.conn.execute('DELETE FROM files WHERE path = ?', (path,))
+                    file_id = self.conn.execute(
+                        'INSERT INTO files (path, domain, digest) VALUES (?, ?, ?)',
+                        (path, domain, digest)
+                    ).lastrowid
+                    self.conn.executemany(
+                        'INSERT INTO messages (file_id, type, msg_type, lang, key, text, original, replacement) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        [(file_id, m['type'], m.get('msg_type'), m['lang'], m['key'], m['text'],
+                          m['original'], m['replacement']) for m in file_info['messages']]
+                    )
+
+            stale = [(path,) for path in existing if path not in seen]
+            self.conn.executemany('DELETE FROM files WHERE path = ?', stale)
+
+        return changed + len(stale)
+
+    def sync_keys(self, lang, domain, translations):
+        """Mirror one flattened lang domain; returns number of rows changed"""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO keys (domain, lang, key, value) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (domain, lang, key) DO UPDATE SET value = excluded.value '
+                'WHERE value IS NOT excluded.value',
+                [(domain, lang, key, value if value is None else str(value))
+                 for key, value in translations.items()]
+            )
+            existing = [row[0] for row in self.conn.execute(
+                'SELECT key FROM keys WHERE domain = ? AND lang = ?', (domain, lang)
+            )]
+            self.conn.executemany(
+                'DELETE FROM keys WHERE domain = ? AND lang = ? AND key = ?',
+                [(domain, lang, key) for key in existing if key not in translations]
+            )
+        return self.conn.total_changes - before
+
+    def sync_replacements(self, modified_files):
+        """Mirror i18n_replacer.py's modified_files list"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO replacements (path, replacements) VALUES (?, ?) '
+                'ON CONFLICT (path) DO UPDATE SET replacements = excluded.replacements '
+                'WHERE replacements != excluded.replacements',
+                [(item['file'], item['replacements']) for item in modified_files]
+            )
+            for item in modified_files:
+                existing = {row[0] for row in self.conn.execute(
+                    'SELECT key FROM replacement_keys WHERE path = ?', (item['file'],)
+                )}
+                written = set(item['keys'])
+                self.conn.executemany(
+                    'DELETE FROM replacement_keys WHERE path = ? AND key = ?',
+                    [(item['file'], key) for key in existing - written]
+                )
+                self.conn.executemany(
+                    'INSERT INTO replacement_keys (path, key) VALUES (?, ?)',
+                    [(item['file'], key) for key in sorted(written - existing)]
+                )
+
+    def files_using_key(self, key):
+        """Files the replacer rewrote to use key (as written in the code)"""
+        return [row[0] for row in self.conn.execute(
+            'SELECT path FROM replacement_keys WHERE key = ? ORDER BY path', (key,)
+        )]
+
+    def untranslated(self, domain):
+        """Keys of a domain present in one of ar/en but missing from the other"""
+        return self.conn.execute(
+            'SELECT k.lang, k.key, k.value FROM keys k WHERE k.domain = ? AND NOT EXISTS ('
+            '  SELECT 1 FROM keys o WHERE o.domain = k.domain AND o.key = k.key AND o.lang != k.lang'
+            ') ORDER BY k.key, k.lang', (domain,)
+        ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the i18n analysis store')
+    parser.add_argument('db')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('files-using').add_argument('key')
+    sub.add_parser('untranslated').add_argument('domain')
+    args = parser.parse_args()
+
+    with AnalysisStore(args.db) as store:
+        if args.command == 'files-using':
+            rows = store.files_using_key(args.key)
+            for path in rows:
+                print(path)
+        else:
+            rows = store.untranslated(args.domain)
+            for lang, key, value in rows:
+                print(f"{args.domain}.{key} only in {lang}: {value}")
+
+    if not rows:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
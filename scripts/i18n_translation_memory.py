@@ -0,0 +1,164 @@
+"""
+CMIS i18n Translation Memory
+MinHash/LSH index over existing lang values so near-duplicate messages
+can reuse an existing key instead of growing the lang files
+"""
+
+import re
+import random
+import hashlib
+from collections import Counter, defaultdict
+
+from i18n_lang_reader import flatten, load_lang_tree
+
+# Mersenne prime for the (a * x + b) mod p permutation family
+PRIME = (1 << 61) - 1
+SHINGLE_SIZE = 3
+
+# Tokens that may differ between two texts without changing their meaning
+STOPWORDS = {
+    'a', 'an', 'the', 'was', 'were', 'is', 'are', 'been', 'has', 'have', 'had',
+    'be', 'your', 'this', 'that', 'please', 'now',
+}
+# Tokens that flip meaning; never allowed to differ
+NEGATIONS = {'not', 'no', 'never', 'cannot', 'cant', 'dont', 'doesnt', 'isnt', 'non', 'لا', 'غير', 'لم', 'لن'}
+NEGATION_PREFIXES = ('un', 'de', 'dis', 'non', 'in')
+PLACEHOLDER_PATTERN = re.compile(r':\w+|\{\w*\}|%[sd]')
+DIGITS_PATTERN = re.compile(r'\d+')
+
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def shingles(text):
+    """Character n-grams of the normalized text"""
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _hash64(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _is_negation_pair(token, others):
+    """token is a negated form of another token (e.g. deactivated/activated)"""
+    return any(
+        token.startswith(prefix) and token[len(prefix):] in others
+        for prefix in NEGATION_PREFIXES
+    )
+
+
+def safe_to_reuse(text, other):
+    """Whether text can reuse other's key without changing the message
+
+    Requires equal placeholders and digits, and that the texts are equal
+    after normalize() or differ only by stopwords.
+    """
+    if sorted(PLACEHOLDER_PATTERN.findall(text)) != sorted(PLACEHOLDER_PATTERN.findall(other)):
+        return False
+    if DIGITS_PATTERN.findall(text) != DIGITS_PATTERN.findall(other):
+        return False
+
+    tokens, other_tokens = Counter(normalize(text).split()), Counter(normalize(other).split())
+    differing = set((tokens - other_tokens) + (other_tokens - tokens))
+    if not differing:
+        return True
+
+    all_tokens = set(tokens) | set(other_tokens)
+    if differing & NEGATIONS or any(_is_negation_pair(t, all_tokens) for t in all_tokens):
+        return False
+    return differing <= STOPWORDS
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TranslationMemory:
+    """Index of (locale, domain, key, text) entries, queryable by similarity
+
+    Signatures are split into `bands` bands of `rows` rows; two texts become
+    candidates when any band matches, then candidates are ranked by exact
+    shingle Jaccard similarity.
+    """
+
+    def __init__(self, bands=8, rows=4, threshold=0.6, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, PRIME), rng.randrange(0, PRIME))
+            for _ in range(bands * rows)
+        ]
+
+        self.entries = []
+        self.buckets = defaultdict(list)
+
+    def signature(self, shingle_set):
+        hashes = [_hash64(s) for s in shingle_set]
+        return [min((a * h + b) % PRIME for h in hashes) for a, b in self.permutations]
+
+    def _band_keys(self, locale, signature):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (locale, band, tuple(signature[start:start + self.rows]))
+
+    def add(self, locale, domain, key, text):
+        """Index one translation value"""
+        if not isinstance(text, str):
+            return
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return
+
+        index = len(self.entries)
+        self.entries.append((locale, domain, key, text, shingle_set))
+        for band_key in self._band_keys(locale, self.signature(shingle_set)):
+            self.buckets[band_key].append(index)
+
+    def query(self, locale, text, domain=None):
+        """Entries similar to text, best first: [(score, domain, key, text)]"""
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return []
+
+        candidates = set()
+        for band_key in self._band_keys(locale, self.signature(shingle_set)):
+            candidates.update(self.buckets.get(band_key, ()))
+
+        matches = []
+        for index in candidates:
+            _, entry_domain, key, entry_text, entry_shingles = self.entries[index]
+            if domain is not None and entry_domain != domain:
+                continue
+            score = jaccard(shingle_set, entry_shingles)
+            if score >= self.threshold:
+                matches.append((score, entry_domain, key, entry_text))
+
+        return sorted(matches, key=lambda m: (-m[0], m[1], m[2]))
+
+    def best_match(self, locale, text, domain=None):
+        matches = self.query(locale, text, domain)
+        return matches[0] if matches else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_lang_dir(cls, lang_dir, locales=('ar', 'en'), **kwargs):
+        """Build a memory over every value in lang_dir/{locale}/*.php"""
+        memory = cls(**kwargs)
+        for locale in locales:
+            for domain, translations in load_lang_tree(lang_dir, locale).items():
+                for key, text in flatten(translations).items():
+                    memory.add(locale, domain, key, text)
+        return memory
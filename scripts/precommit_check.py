@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+CMIS Pre-commit Check
+Check-only mode of the i18n and @test annotation tools for staged files;
+never writes anything. Files are read from the index (the staged
+content) with a single `git cat-file --batch` call.
+
+Usage (.git/hooks/pre-commit):
+    git diff --cached --name-only --diff-filter=ACMR | python3 scripts/precommit_check.py
+"""
+
+import re
+import sys
+import subprocess
+
+# Skip generated/minified files instead of scanning them
+MAX_FILE_BYTES = 512 * 1024
+
+CONTROLLER_PREFIX = 'app/Http/Controllers/'
+TEST_PREFIX = 'tests/'
+
+# Same patterns as i18n_controller_fixer.py / i18n_replacer.py
+HARDCODED_PATTERNS = [
+    (re.compile(r"with\('(?:success|error|warning|info)',\s*'([^']+)'\)"), 'flash message'),
+    (re.compile(r"\[(['\"])message\1\]\s*=>\s*'([^']+)'"), 'JSON message'),
+    (re.compile(r"throw new [\\a-zA-Z]+Exception\('([^']+)'\)"), 'exception message'),
+]
+
+# Same annotation forms as convert_test_annotations.py
+TEST_ANNOTATION = re.compile(r'/\*\*\s*@test\s*\*/')
+
+def line_of(content, offset):
+    return content.count('\n', 0, offset) + 1
+
+def read_staged(paths):
+    """Yield (path, content) for each path's staged blob; content is None if skipped"""
+    if not paths:
+        return
+    result = subprocess.run(
+        ['git', 'cat-file', '--batch'],
+        input=''.join(f':{path}\n' for path in paths).encode('utf-8'),
+        capture_output=True, check=True
+    )
+    out = result.stdout
+    pos = 0
+    for path in paths:
+        end = out.index(b'\n', pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if header[-1] == b'missing':
+            # Not in the index (deleted/unstaged): nothing to check
+            continue
+        size = int(header[2])
+        blob = out[pos:pos + size]
+        pos += size + 1
+        if size > MAX_FILE_BYTES:
+            print(f"{path}: skipped (too large, {size} bytes)", file=sys.stderr)
+            yield path, None
+        else:
+            yield path, blob.decode('utf-8', errors='replace')
+
+def check_controller(path, content):
+    for pattern, label in HARDCODED_PATTERNS:
+        for match in pattern.finditer(content):
+            yield f"{path}:{line_of(content, match.start())}: hardcoded {label}: {match.group(match.lastindex)!r}"
+
+def check_test(path, content):
+    for match in TEST_ANNOTATION.finditer(content):
+        yield f"{path}:{line_of(content, match.start())}: deprecated /** @test */ annotation, use #[Test]"
+
+def main():
+    checks = {}
+    for line in sys.stdin:
+        path = line.strip()
+        if not path.endswith('.php'):
+            continue
+
+        if path.startswith(CONTROLLER_PREFIX):
+            checks[path] = check_controller
+        elif path.startswith(TEST_PREFIX):
+            checks[path] = check_test
+
+    problems = []
+    for path, content in read_staged(list(checks)):
+        if content is not None:
+            problems.extend(checks[path](path, content))
+
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        print(f"\n✗ {len(problems)} problems found. Use __('domain.key') for messages "
+              f"(scripts/i18n_replacer.py) and #[Test] attributes (convert_test_annotations.py).",
+              file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
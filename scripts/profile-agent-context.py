@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Profile the context size of agent files, including the _shared/ files
+they reference, and flag agents over a token budget.
+Per-file results are cached by content hash so reruns are instant.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+import argparse
+
+AGENTS_DIR = '/home/cmis-test/public_html/.claude/agents'
+SHARED_DIR = os.path.join(AGENTS_DIR, '_shared')
+CACHE_FILE = os.path.join(AGENTS_DIR, '_shared', '.profile-cache.json')
+
+DEFAULT_BUDGET = 8000
+
+# References such as `.claude/agents/_shared/browser-testing-integration.md`
+SHARED_REF_PATTERN = re.compile(r'(?:\.claude/agents/)?_shared/([\w./-]+\.md)')
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*)$')
+TOKEN_PIECE_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+
+def estimate_tokens(text):
+    """Approximate tokenizer count: ~4 chars per word piece, 1 per symbol."""
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        tokens += -(-len(piece) // 4) if piece[0].isalnum() or piece[0] == '_' else 1
+    return tokens
+
+
+def split_sections(content):
+    """Split markdown into (heading, text) sections, ignoring fenced code."""
+    sections = []
+    heading = '(preamble)'
+    lines = []
+    in_fence = False
+
+    for line in content.splitlines(keepends=True):
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line.rstrip('\n'))
+        if match:
+            if lines:
+                sections.append((heading, ''.join(lines)))
+            heading = line.strip()
+            lines = []
+        lines.append(line)
+
+    if lines:
+        sections.append((heading, ''.join(lines)))
+    return sections
+
+
+def profile_content(content):
+    """Size profile of one markdown file (cacheable by content hash)."""
+    return {
+        'bytes': len(content.encode('utf-8')),
+        'tokens': estimate_tokens(content),
+        'sections': [
+            {'heading': heading, 'tokens': estimate_tokens(text)}
+            for heading, text in split_sections(content)
+        ],
+        'shared_refs': sorted(set(SHARED_REF_PATTERN.findall(content))),
+    }
+
+
+class Profiler:
+    """Profiles files through a content-hash cache."""
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self.cache = {}
+        self.used = set()
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+
+    def profile(self, filepath):
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        self.used.add(digest)
+        if digest not in self.cache:
+            self.cache[digest] = profile_content(raw.decode('utf-8'))
+        return self.cache[digest]
+
+    def effective(self, filepath):
+        """Own profile plus every shared file reachable through references."""
+        own = self.profile(filepath)
+        resolved = {}
+        missing = []
+        pending = list(own['shared_refs'])
+
+        while pending:
+            ref = pending.pop()
+            if ref in resolved or ref in missing:
+                continue
+            shared_path = os.path.join(SHARED_DIR, ref)
+            if not os.path.exists(shared_path):
+                missing.append(ref)
+                continue
+            resolved[ref] = self.profile(shared_path)
+            pending.extend(resolved[ref]['shared_refs'])
+
+        return {
+            'file': os.path.basename(filepath),
+            'tokens': own['tokens'],
+            'bytes': own['bytes'],
+            'sections': own['sections'],
+            'shared': {ref: resolved[ref]['tokens'] for ref in sorted(resolved)},
+            'missing_shared': sorted(missing),
+            'effective_tokens': own['tokens'] + sum(p['tokens'] for p in resolved.values()),
+            'effective_bytes': own['bytes'] + sum(p['bytes'] for p in resolved.values()),
+        }
+
+    def save(self):
+        # Drop entries for content that no longer exists
+        cache = {digest: self.cache[digest] for digest in sorted(self.used)}
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+
+
+def main():
+    """Profile all agent files."""
+    parser = argparse.ArgumentParser(description='Profile agent markdown context size')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET,
+                        help=f'flag agents whose effective token count exceeds this (default: {DEFAULT_BUDGET})')
+    parser.add_argument('--sections', action='store_true',
+                        help='show the largest sections of each agent over budget')
+    parser.add_argument('--json', action='store_true', help='print the full profile as JSON')
+    args = parser.parse_args()
+
+    agent_files = glob.glob(os.path.join(AGENTS_DIR, '*.md'))
+
+    # Exclude shared files and README
+    agent_files = [f for f in agent_files if '/_shared/' not in f and 'README' not in f]
+
+    profiler = Profiler(CACHE_FILE)
+    results = [profiler.effective(f) for f in sorted(agent_files)]
+    profiler.save()
+
+    over_budget = [r for r in results if r['effective_tokens'] > args.budget]
+
+    if args.json:
+        print(json.dumps({'budget': args.budget, 'agents': results}, ensure_ascii=False, indent=2))
+        sys.exit(1 if over_budget else 0)
+
+    print(f"Profiling {len(results)} agent files (budget: {args.budget:,} tokens)...\n")
+    print(f"{'Agent':<50} {'Own':>8} {'Shared':>8} {'Effective':>10}")
+    print('-' * 80)
+
+    for r in sorted(results, key=lambda r: r['effective_tokens'], reverse=True):
+        marker = '❌' if r['effective_tokens'] > args.budget else '  '
+        shared = r['effective_tokens'] - r['tokens']
+        print(f"{marker}{r['file']:<48} {r['tokens']:>8,} {shared:>8,} {r['effective_tokens']:>10,}")
+        for ref in r['missing_shared']:
+            print(f"    ⚠️  missing shared file: _shared/{ref}")
+        if args.sections and r['effective_tokens'] > args.budget:
+            for section in sorted(r['sections'], key=lambda s: s['tokens'], reverse=True)[:5]:
+                print(f"      {section['tokens']:>6,}  {section['heading'][:60]}")
+
+    total_tokens = sum(r['effective_tokens'] for r in results)
+    total_bytes = sum(r['effective_bytes'] for r in results)
+
+    print(f"\n{'=' * 50}")
+    print(f"Total agents: {len(results)}")
+    print(f"Over budget: {len(over_budget)}")
+    print(f"Total effective: {total_tokens:,} tokens ({total_bytes / 1024:.1f} KB)")
+
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Static test-impact analysis for the PHPUnit suite.
+Maps changed controllers, routes, lang domains and app classes to the test
+classes that reference them, so an i18n migration only reruns affected tests.
+
+Usage:
+    git diff --name-only | python3 test_impact_analysis.py
+    python3 test_impact_analysis.py --filter app/Http/Controllers/Foo.php
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from convert_test_annotations import find_test_files
+
+CONTROLLERS_DIR = Path('app/Http/Controllers')
+ROUTES_DIR = Path('routes')
+CACHE_FILE = Path('storage/framework/cache/test-impact-graph.json')
+CACHE_VERSION = 1
+
+# Route files registered with an 'api' URI prefix in bootstrap/app.php
+API_ROUTE_FILES = {'api.php', 'api-ai-quota.php', 'api-backup.php', 'vector-embeddings-v2.php'}
+
+# Changes to these never affect PHPUnit results
+IGNORED_SUFFIXES = ('.md', '.txt', '.cjs', '.js', '.css', '.py', '.sh')
+
+STRING_OR_COMMENT = re.compile(
+    r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|//[^\n]*|\#[^\n]*|/\*.*?\*/""", re.DOTALL
+)
+USE_STATEMENT = re.compile(r'^use\s+([\w\\]+)(?:\\\{([^}]*)\}|\s+as\s+(\w+))?\s*;', re.MULTILINE)
+FQCN_REFERENCE = re.compile(r'\\?\b(App\\[\w\\]+)')
+LANG_DOMAIN = re.compile(r"""(?:__|trans|trans_choice|@lang)\(\s*['"]([\w-]+)\.""")
+ROUTE_CALL = re.compile(r"""\broute\(\s*['"]([\w.-]+)['"]""")
+URI_LITERAL = re.compile(r"""['"](/[^'"\s]*)['"]""")
+
+ROUTE_TOKEN = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|Route::|[{};]""")
+ROUTE_VERB = re.compile(
+    r"""Route::(?:get|post|put|patch|delete|options|any|match)\(\s*(?:\[[^\]]*\]\s*,\s*)?['"]([^'"]*)['"]"""
+)
+ROUTE_RESOURCE = re.compile(
+    r"""Route::(?:api)?[rR]esources?\(\s*['"]([^'"]+)['"]\s*,\s*\\?([\w\\]+)::class"""
+)
+ACTION_CONTROLLER = re.compile(r'\[\s*\\?([\w\\]+)::class')
+INVOKABLE_CONTROLLER = re.compile(r',\s*\\?([\w\\]+)::class\s*\)')
+GROUP_CONTROLLER = re.compile(r'Route::controller\(\s*\\?([\w\\]+)::class')
+PREFIX_CALL = re.compile(r"""prefix\(\s*['"]([^'"]*)['"]""")
+NAME_CALL = re.compile(r"""(?:name|as)\(\s*['"]([^'"]*)['"]""")
+
+def strip_comments(content):
+    """Remove PHP comments, keeping string literals intact."""
+    return STRING_OR_COMMENT.sub(lambda m: m.group(1) or ' ', content)
+
+def parse_imports(content):
+    """Map short class names to FQCNs from top-level use statements."""
+    imports = {}
+    for base, group, alias in USE_STATEMENT.findall(content):
+        if group:
+            for item in group.split(','):
+                parts = item.split()
+                if parts:
+                    imports[parts[-1]] = f"{base}\\{parts[0]}"
+        else:
+            imports[alias or base.rsplit('\\', 1)[-1]] = base
+    return imports
+
+def resolve_class(name, imports):
+    """Resolve a class reference to its FQCN using the file's imports."""
+    name = name.lstrip('\\')
+    head, _, rest = name.partition('\\')
+    if head in imports:
+        return imports[head] + (f'\\{rest}' if rest else '')
+    return name
+
+def join_uri(*parts):
+    return '/'.join(p.strip('/') for p in parts if p and p.strip('/'))
+
+def uri_segments(uri):
+    """Split a URI into segments with parameters and interpolations as '*'."""
+    uri = uri.split('?', 1)[0]
+    uri = re.sub(r'\{[^}]*\}|\$[\w>-]+', '*', uri)
+    return ['*' if '*' in segment else segment for segment in uri.strip('/').split('/') if segment]
+
+def uri_matches(test_uri, route_uri, is_prefix=False):
+    test, route = uri_segments(test_uri), uri_segments(route_uri)
+    if len(test) != len(route) and not (is_prefix and len(test) > len(route)):
+        return False
+    return all(r == t or '*' in (r, t) for r, t in zip(route, test))
+
+def parse_routes(content, api_prefix=''):
+    """Extract routes with their controller, full name and full URI."""
+    content = strip_comments(content)
+    imports = parse_imports(content)
+    frames = [{'depth': 0, 'name': '', 'uri': api_prefix, 'controller': None}]
+    routes = []
+    depth = 0
+    segment_start = None
+
+    def finish(end):
+        text = content[segment_start:end]
+        frame = frames[-1]
+
+        resource = ROUTE_RESOURCE.search(text)
+        if resource:
+            routes.append({
+                'controller': resolve_class(resource.group(2), imports),
+                'name': frame['name'] + resource.group(1) + '.',
+                'uri': join_uri(frame['uri'], resource.group(1).replace('.', '/')),
+                'prefix': True,
+            })
+            return
+
+        verb = ROUTE_VERB.search(text)
+        if not verb:
+            return
+        action = ACTION_CONTROLLER.search(text) or INVOKABLE_CONTROLLER.search(text)
+        controller = resolve_class(action.group(1), imports) if action else frame['controller']
+        if controller is None:
+            return
+        name = re.search(r"""->name\(\s*['"]([^'"]+)['"]""", text)
+        routes.append({
+            'controller': controller,
+            'name': frame['name'] + name.group(1) if name else None,
+            'uri': join_uri(frame['uri'], verb.group(1)),
+            'prefix': False,
+        })
+
+    for match in ROUTE_TOKEN.finditer(content):
+        token = match.group(0)
+        if token == 'Route::':
+            if segment_start is not None:
+                finish(match.start())
+            segment_start = match.start()
+        elif token == '{':
+            depth += 1
+            if segment_start is not None:
+                text = content[segment_start:match.start()]
+                if 'group(' in text:
+                    parent = frames[-1]
+                    prefix = PREFIX_CALL.search(text)
+                    name = NAME_CALL.search(text.split('group(', 1)[0])
+                    controller = GROUP_CONTROLLER.search(text)
+                    frames.append({
+                        'depth': depth,
+                        'name': parent['name'] + (name.group(1) if name else ''),
+                        'uri': join_uri(parent['uri'], prefix.group(1) if prefix else ''),
+                        'controller': resolve_class(controller.group(1), imports) if controller else parent['controller'],
+                    })
+                else:
+                    finish(match.start())
+                segment_start = None
+        elif token == '}':
+            depth -= 1
+            while len(frames) > 1 and frames[-1]['depth'] > depth:
+                frames.pop()
+        elif token == ';' and segment_start is not None:
+            finish(match.start())
+            segment_start = None
+
+    return routes
+
+def app_class_fqcn(path):
+    """app/Http/Controllers/Foo/BarController.php -> App\\Http\\Controllers\\Foo\\BarController"""
+    parts = Path(path).with_suffix('').parts
+    return '\\'.join(['App'] + list(parts[1:]))
+
+def scan_file(path, kind):
+    """Extract the references used by the graph from one file."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+
+    if kind == 'routes':
+        api_prefix = 'api' if Path(path).name in API_ROUTE_FILES else ''
+        return {'routes': parse_routes(content, api_prefix)}
+
+    imports = parse_imports(content)
+    facts = {
+        'classes': sorted(set(imports.values()) | set(FQCN_REFERENCE.findall(content))),
+        'lang_domains': sorted(set(LANG_DOMAIN.findall(content))),
+    }
+    if kind == 'test':
+        facts['route_names'] = sorted(set(ROUTE_CALL.findall(content)))
+        facts['uris'] = sorted(set(URI_LITERAL.findall(content)))
+    return facts
+
+class ImpactGraph:
+    """Per-file reference facts, cached and refreshed incrementally by mtime/size."""
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.facts = {}
+        self.rescanned = 0
+        if cache_file.exists():
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                self.facts = cache['files']
+
+    def refresh(self):
+        sources = [(str(p), 'test') for p in find_test_files() if p.name.endswith('Test.php')]
+        sources += [(str(p), 'controller') for p in CONTROLLERS_DIR.rglob('*.php')]
+        sources += [(str(p), 'routes') for p in ROUTES_DIR.glob('*.php')]
+
+        facts = {}
+        for path, kind in sorted(sources):
+            stat = os.stat(path)
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            cached = self.facts.get(path)
+            if cached and cached['stamp'] == stamp:
+                facts[path] = cached
+            else:
+                facts[path] = {'kind': kind, 'stamp': stamp, **scan_file(path, kind)}
+                self.rescanned += 1
+        self.facts = facts
+
+    def save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.facts}, f)
+
+    def files(self, kind):
+        return {path: facts for path, facts in self.facts.items() if facts['kind'] == kind}
+
+    def affected_tests(self, changed):
+        """Return (tests, run_all) for a list of changed paths."""
+        tests = self.files('test')
+        controllers = self.files('controller')
+        route_files = self.files('routes')
+
+        changed_controllers = set()
+        changed_classes = set()
+        changed_domains = set()
+        selected = set()
+
+        for path in changed:
+            path = Path(path).as_posix()
+            parts = Path(path).parts
+            if path in tests:
+                selected.add(path)
+            elif parts[0] == 'tests':
+                # TestCase, traits, fixtures: anything a test may load
+                return sorted(tests), True
+            elif path in route_files:
+                changed_controllers.update(r['controller'] for r in route_files[path]['routes'])
+            elif path.startswith(f'{CONTROLLERS_DIR.as_posix()}/') and path.endswith('.php'):
+                changed_controllers.add(app_class_fqcn(path))
+            elif len(parts) >= 3 and parts[-3] == 'lang' and path.endswith('.php'):
+                changed_domains.add(Path(path).stem)
+            elif parts[0] == 'app' and path.endswith('.php'):
+                changed_classes.add(app_class_fqcn(path))
+            elif not path.endswith(IGNORED_SUFFIXES):
+                # Views, config, migrations, composer files...
+                return sorted(tests), True
+
+        for path, facts in controllers.items():
+            if changed_classes & set(facts['classes']) or changed_domains & set(facts['lang_domains']):
+                changed_controllers.add(app_class_fqcn(path))
+
+        routes = [r for f in route_files.values() for r in f['routes'] if r['controller'] in changed_controllers]
+        route_names = {r['name'] for r in routes if r['name'] and not r['prefix']}
+        name_prefixes = tuple(r['name'] for r in routes if r['name'] and r['prefix'])
+        short_names = {c.rsplit('\\', 1)[-1] for c in changed_controllers}
+        changed_classes |= changed_controllers
+
+        for path, facts in tests.items():
+            if (
+                changed_classes & set(facts['classes'])
+                or changed_domains & set(facts['lang_domains'])
+                or Path(path).stem[:-len('Test')] in short_names
+                or route_names & set(facts['route_names'])
+                or (name_prefixes and any(name.startswith(name_prefixes) for name in facts['route_names']))
+                or any(uri_matches(uri, r['uri'], r['prefix']) for uri in facts['uris'] for r in routes)
+            ):
+                selected.add(path)
+
+        return sorted(selected), False
+
+def main():
+    """Print the tests affected by the changed files given as arguments or on stdin."""
+    parser = argparse.ArgumentParser(description='List PHPUnit tests affected by changed files')
+    parser.add_argument('files', nargs='*', help='changed files (default: read from stdin)')
+    parser.add_argument('--filter', action='store_true', help='print a PHPUnit --filter pattern instead of paths')
+    args = parser.parse_args()
+
+    changed = args.files or [line.strip() for line in sys.stdin if line.strip()]
+
+    graph = ImpactGraph()
+    graph.refresh()
+    graph.save()
+
+    tests, run_all = graph.affected_tests(changed)
+    print(f"Graph: {len(graph.facts)} files ({graph.rescanned} rescanned)", file=sys.stderr)
+    print(f"Affected tests: {len(tests)}{' (full suite)' if run_all else ''}", file=sys.stderr)
+
+    if args.filter:
+        if tests:
+            print('(' + '|'.join(sorted(Path(t).stem for t in tests)) + ')')
+    else:
+        for test in tests:
+            print(test)
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,12 @@
 import { defineConfig } from 'vite';
 import laravel from 'laravel-vite-plugin';
+import fs from 'fs';
+
+// Per-locale, per-domain translation chunks emitted by scripts/i18n_processor.py
+const i18nManifestPath = 'public/lang/manifest.json';
+const i18nManifest = fs.existsSync(i18nManifestPath)
+    ? JSON.parse(fs.readFileSync(i18nManifestPath, 'utf-8'))
+    : {};
 
 export default defineConfig({
     plugins: [
@@ -8,6 +15,9 @@ export default defineConfig({
             refresh: true,
         }),
     ],
+    define: {
+        __I18N_MANIFEST__: JSON.stringify(i18nManifest),
+    },
     build: {
         // Optimize bundle size
         rollupOptions: {